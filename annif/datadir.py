@@ -9,6 +9,8 @@ import os.path
 class DatadirMixin:
     """Mixin class for types that need a data directory for storing files"""
 
+    __slots__ = ("_datadir_path",)
+
     def __init__(self, datadir: str, typename: str, identifier: str) -> None:
         self._datadir_path = os.path.join(datadir, typename, identifier)
 
@@ -4,14 +4,9 @@ from __future__ import annotations
 
 import enum
 import os.path
-from shutil import rmtree
 from typing import TYPE_CHECKING
 
 import annif
-import annif.analyzer
-import annif.backend
-import annif.corpus
-import annif.transform
 from annif.datadir import DatadirMixin
 from annif.exception import (
     AnnifException,
@@ -22,6 +17,7 @@ from annif.exception import (
 
 if TYPE_CHECKING:
     from collections import defaultdict
+    from collections.abc import Iterable, Iterator
     from configparser import SectionProxy
     from datetime import datetime
 
@@ -33,6 +29,7 @@ if TYPE_CHECKING:
     from annif.corpus.document import DocumentCorpus
     from annif.corpus.subject import SubjectIndex
     from annif.registry import AnnifRegistry
+    from annif.suggestion import SuggestionBatch, SuggestionResults
     from annif.transform.transform import TransformChain
     from annif.vocab import AnnifVocabulary
 
@@ -50,13 +47,25 @@ class Access(enum.IntEnum):
 class AnnifProject(DatadirMixin):
     """Class representing the configuration of a single Annif project."""
 
-    # defaults for uninitialized instances
-    _transform = None
-    _analyzer = None
-    _backend = None
-    _vocab = None
-    _vocab_lang = None
-    initialized = False
+    __slots__ = (
+        "project_id",
+        "name",
+        "language",
+        "analyzer_spec",
+        "transform_spec",
+        "vocab_spec",
+        "config",
+        "_base_datadir",
+        "registry",
+        "access",
+        "_transform",
+        "_analyzer",
+        "_backend",
+        "_vocab",
+        "_vocab_lang",
+        "_is_trained_cache",
+        "initialized",
+    )
 
     # default values for configuration settings
     DEFAULT_ACCESS = "public"
@@ -80,15 +89,24 @@ class AnnifProject(DatadirMixin):
         self.registry = registry
         self._init_access()
 
+        # defaults for uninitialized instances
+        self._transform = None
+        self._analyzer = None
+        self._backend = None
+        self._vocab = None
+        self._vocab_lang = None
+        self._is_trained_cache = None
+        self.initialized = False
+
     def _init_access(self) -> None:
         access = self.config.get("access", self.DEFAULT_ACCESS)
-        try:
-            self.access = getattr(Access, access)
-        except AttributeError:
+        members = Access.__members__
+        if access not in members:
             raise ConfigurationException(
                 "'{}' is not a valid access setting".format(access),
                 project_id=self.project_id,
             )
+        self.access = members[access]
 
     def _initialize_analyzer(self) -> None:
         if not self.analyzer_spec:
@@ -137,16 +155,24 @@ class AnnifProject(DatadirMixin):
         self,
         texts: list[str],
         backend_params: defaultdict[str, dict] | None,
-    ) -> annif.suggestion.SuggestionBatch:
+    ) -> SuggestionBatch:
+        backend = self.backend
+        return backend.suggest(texts, self._get_backend_params(backend, backend_params))
+
+    @staticmethod
+    def _get_backend_params(
+        backend: AnnifBackend, backend_params: defaultdict[str, dict] | None
+    ) -> dict:
         if backend_params is None:
-            backend_params = {}
-        beparams = backend_params.get(self.backend.backend_id, {})
-        return self.backend.suggest(texts, beparams)
+            return {}
+        return backend_params.get(backend.backend_id, {})
 
     @property
     def analyzer(self) -> Analyzer:
         if self._analyzer is None:
             if self.analyzer_spec:
+                import annif.analyzer
+
                 self._analyzer = annif.analyzer.get_analyzer(self.analyzer_spec)
             else:
                 raise ConfigurationException(
@@ -157,6 +183,8 @@ class AnnifProject(DatadirMixin):
     @property
     def transform(self) -> TransformChain:
         if self._transform is None:
+            import annif.transform
+
             self._transform = annif.transform.get_transform(
                 self.transform_spec, project=self
             )
@@ -170,6 +198,8 @@ class AnnifProject(DatadirMixin):
                     "backend setting is missing", project_id=self.project_id
                 )
             backend_id = self.config["backend"]
+            import annif.backend
+
             try:
                 backend_class = annif.backend.get_backend(backend_id)
                 self._backend = backend_class(
@@ -219,7 +249,19 @@ class AnnifProject(DatadirMixin):
 
     @property
     def is_trained(self) -> bool | None:
-        return self._get_info("is_trained")
+        if self._is_trained_cache:
+            return self._is_trained_cache
+        is_trained = self._get_info("is_trained")
+        if self.initialized and is_trained and not self._uses_sources:
+            # a trained model stays trained until this project modifies it
+            self._is_trained_cache = is_trained
+        return is_trained
+
+    @property
+    def _uses_sources(self) -> bool:
+        # ensemble-type backends (ensemble, pav, nn_ensemble) depend on the
+        # train state of their source projects, which may change independently
+        return "sources" in self.config
 
     @property
     def modification_time(self) -> datetime | None:
@@ -229,28 +271,129 @@ class AnnifProject(DatadirMixin):
         self,
         corpus: DocumentCorpus,
         backend_params: defaultdict[str, dict] | None = None,
-    ) -> annif.suggestion.SuggestionResults:
-        """Suggest subjects for the given documents corpus in batches of documents."""
-        suggestions = (
-            self.suggest([doc.text for doc in doc_batch], backend_params)
-            for doc_batch in corpus.doc_batches
-        )
+        jobs: int = 1,
+        pipeline: bool = False,
+    ) -> SuggestionResults:
+        """Suggest subjects for the given documents corpus in batches of documents.
+        If jobs is not 1, the batches are processed in parallel using a pool of
+        threads (0 means all CPUs), with at most 2 * jobs batches in flight.
+        Unlike the jobs parameter elsewhere in Annif, this never uses
+        subprocesses, so it only speeds up backends that release the GIL. The
+        threads share the analyzer and backend of the project, so jobs other
+        than 1 must not be used with components that are not thread-safe, such
+        as the voikko analyzer. If the project has already been initialized
+        without parallel=True, it is not reinitialized for parallel use.
+
+        If pipeline is True, the texts of the next batch are transformed in a
+        separate thread while the backend processes the current batch. The
+        transform thread may use the project analyzer (e.g. the filter_lang
+        transform) at the same time as the backend, so the same thread-safety
+        caveat applies. The pipeline cannot be combined with jobs other than 1."""
+        if pipeline and jobs != 1:
+            raise ValueError("pipeline can only be used with jobs=1")
+        if jobs != 1:
+            suggestions = self._suggest_batches_parallel(corpus, backend_params, jobs)
+        elif pipeline:
+            suggestions = self._suggest_batches_pipelined(corpus, backend_params)
+        else:
+            suggestions = (
+                self.suggest((doc.text for doc in doc_batch), backend_params)
+                for doc_batch in corpus.doc_batches
+            )
         import annif.suggestion
 
         return annif.suggestion.SuggestionResults(suggestions)
 
-    def suggest(
+    def _suggest_batches_parallel(
         self,
-        texts: list[str],
-        backend_params: defaultdict[str, dict] | None = None,
-    ) -> annif.suggestion.SuggestionBatch:
-        """Suggest subjects for the given documents batch."""
-        if not self.is_trained:
-            if self.is_trained is None:
+        corpus: DocumentCorpus,
+        backend_params: defaultdict[str, dict] | None,
+        jobs: int,
+    ) -> Iterator[SuggestionBatch]:
+        import collections
+        from concurrent.futures import ThreadPoolExecutor
+
+        self.initialize(parallel=True)
+        if jobs < 1:
+            jobs = os.cpu_count() or 1
+
+        def suggest_batch(doc_batch):
+            return self.suggest((doc.text for doc in doc_batch), backend_params)
+
+        # submit new batches only as results are consumed, to keep memory bounded
+        pending = collections.deque()
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            try:
+                for doc_batch in corpus.doc_batches:
+                    pending.append(executor.submit(suggest_batch, doc_batch))
+                    if len(pending) >= 2 * jobs:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _suggest_batches_pipelined(
+        self,
+        corpus: DocumentCorpus,
+        backend_params: defaultdict[str, dict] | None,
+    ) -> Iterator[SuggestionBatch]:
+        import queue
+        import threading
+
+        self._check_trained()
+        transformed = queue.Queue(maxsize=2)
+        stop = threading.Event()
+
+        def transform_batches():
+            try:
+                for doc_batch in corpus.doc_batches:
+                    if stop.is_set():
+                        break
+                    texts = (doc.text for doc in doc_batch)
+                    transformed.put(self.transform.transform_texts(texts))
+            except Exception as err:
+                transformed.put(err)
+            finally:
+                transformed.put(None)  # end of input
+
+        producer = threading.Thread(target=transform_batches, daemon=True)
+        producer.start()
+        finished = False
+        try:
+            while True:
+                texts = transformed.get()
+                if texts is None:
+                    finished = True
+                    break
+                if isinstance(texts, Exception):
+                    raise texts
+                yield self._suggest_with_backend(texts, backend_params)
+        finally:
+            if not finished:
+                # stopped early, let the producer finish and drain the queue
+                stop.set()
+                while transformed.get() is not None:
+                    pass
+            producer.join()
+
+    def _check_trained(self) -> None:
+        is_trained = self.is_trained
+        if not is_trained:
+            if is_trained is None:
                 logger.warning("Could not get train state information.")
             else:
                 raise NotInitializedException("Project is not trained.")
-        texts = [self.transform.transform_text(text) for text in texts]
+
+    def suggest(
+        self,
+        texts: Iterable[str],
+        backend_params: defaultdict[str, dict] | None = None,
+    ) -> SuggestionBatch:
+        """Suggest subjects for the given documents batch."""
+        self._check_trained()
+        texts = self.transform.transform_texts(texts)
         return self._suggest_with_backend(texts, backend_params)
 
     def train(
@@ -262,10 +405,9 @@ class AnnifProject(DatadirMixin):
         """train the project using documents from a metadata source"""
         if corpus != "cached":
             corpus = self.transform.transform_corpus(corpus)
-        if backend_params is None:
-            backend_params = {}
-        beparams = backend_params.get(self.backend.backend_id, {})
-        self.backend.train(corpus, beparams, jobs)
+        backend = self.backend
+        self._is_trained_cache = None
+        backend.train(corpus, self._get_backend_params(backend, backend_params), jobs)
 
     def learn(
         self,
@@ -273,12 +415,14 @@ class AnnifProject(DatadirMixin):
         backend_params: defaultdict[str, dict] | None = None,
     ) -> None:
         """further train the project using documents from a metadata source"""
-        if backend_params is None:
-            backend_params = {}
-        beparams = backend_params.get(self.backend.backend_id, {})
+        backend = self.backend
+        beparams = self._get_backend_params(backend, backend_params)
         corpus = self.transform.transform_corpus(corpus)
-        if isinstance(self.backend, annif.backend.backend.AnnifLearningBackend):
-            self.backend.learn(corpus, beparams)
+        import annif.backend.backend
+
+        if isinstance(backend, annif.backend.backend.AnnifLearningBackend):
+            self._is_trained_cache = None
+            backend.learn(corpus, beparams)
         else:
             raise NotSupportedException(
                 "Learning not supported by backend", project_id=self.project_id
@@ -294,6 +438,8 @@ class AnnifProject(DatadirMixin):
     ) -> HPRecommendation:
         """optimize the hyperparameters of the project using a validation
         corpus against a given metric"""
+        import annif.backend.hyperopt
+
         if isinstance(self.backend, annif.backend.hyperopt.AnnifHyperoptBackend):
             optimizer = self.backend.get_hp_optimizer(corpus, metric)
             return optimizer.optimize(trials, jobs, results_file)
@@ -317,10 +463,11 @@ class AnnifProject(DatadirMixin):
     def remove_model_data(self) -> None:
         """remove the data of this project"""
         datadir_path = self._datadir_path
+        self._is_trained_cache = None
         if os.path.isdir(datadir_path):
+            from shutil import rmtree
+
             rmtree(datadir_path)
-            logger.info("Removed model data for project {}.".format(self.project_id))
+            logger.info("Removed model data for project %s.", self.project_id)
         else:
-            logger.warning(
-                "No model data to remove for project {}.".format(self.project_id)
-            )
+            logger.warning("No model data to remove for project %s.", self.project_id)
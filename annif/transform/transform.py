@@ -9,6 +9,8 @@ from annif.corpus import TransformingDocumentCorpus
 from annif.exception import ConfigurationException
 
 if TYPE_CHECKING:
+    from collections.abc import Iterable
+
     from annif.corpus.types import DocumentCorpus
     from annif.project import AnnifProject
 
@@ -27,6 +29,10 @@ class BaseTransform(metaclass=abc.ABCMeta):
         """Perform the text transformation."""
         pass  # pragma: no cover
 
+    def transform_texts(self, texts: Iterable[str]) -> list[str]:
+        """Perform the text transformation on a batch of texts."""
+        return [self.transform_fn(text) for text in texts]
+
 
 class IdentityTransform(BaseTransform):
     """Transform that does not modify text but simply passes it through."""
@@ -36,6 +42,9 @@ class IdentityTransform(BaseTransform):
     def transform_fn(self, text: str) -> str:
         return text
 
+    def transform_texts(self, texts: Iterable[str]) -> list[str]:
+        return list(texts)
+
 
 class TransformChain:
     """Class instantiating and holding the transformation objects performing
@@ -72,5 +81,12 @@ class TransformChain:
             text = trans.transform_fn(text)
         return text
 
+    def transform_texts(self, texts: Iterable[str]) -> list[str]:
+        if not self.transforms:
+            return list(texts)
+        for trans in self.transforms:
+            texts = trans.transform_texts(texts)
+        return texts
+
     def transform_corpus(self, corpus: DocumentCorpus) -> TransformingDocumentCorpus:
         return TransformingDocumentCorpus(corpus, self.transform_text)
@@ -2,12 +2,17 @@
 
 import logging
 from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
 
 import pytest
 
 import annif.backend.dummy
 import annif.project
-from annif.exception import ConfigurationException, NotSupportedException
+from annif.exception import (
+    ConfigurationException,
+    NotInitializedException,
+    NotSupportedException,
+)
 from annif.project import Access
 
 
@@ -263,6 +268,87 @@ def test_project_suggest_corpus(registry, fulltext_corpus):
     assert first_doc_hits[0].score == 1.0
 
 
+def test_project_suggest_corpus_parallel(registry, fulltext_corpus, monkeypatch):
+    monkeypatch.setattr(fulltext_corpus, "DOC_BATCH_SIZE", 4)
+    project = registry.get_project("dummy-fi")
+    result = list(project.suggest_corpus(fulltext_corpus, jobs=2))
+    assert len(result) == 28  # Number of documents
+    serial_result = list(project.suggest_corpus(fulltext_corpus))
+    assert [list(hits) for hits in result] == [list(hits) for hits in serial_result]
+
+
+def test_project_suggest_corpus_parallel_order(registry, monkeypatch):
+    # the dummy backend gives no hits for empty texts
+    texts = ["some text" if i % 3 else "" for i in range(30)]
+    corpus = annif.corpus.DocumentList(
+        [annif.corpus.Document(text=text, subject_set=None) for text in texts]
+    )
+    monkeypatch.setattr(corpus, "DOC_BATCH_SIZE", 4)
+    project = registry.get_project("dummy-fi")
+    result = list(project.suggest_corpus(corpus, jobs=3))
+    assert [len(hits) for hits in result] == [1 if text else 0 for text in texts]
+
+
+def test_project_suggest_corpus_parallel_bounded(registry):
+    read_batches = []
+
+    def doc_batches():
+        for i in range(1000):
+            read_batches.append(i)
+            yield [annif.corpus.Document(text="some text", subject_set=None)]
+
+    corpus = SimpleNamespace(doc_batches=doc_batches())
+    project = registry.get_project("dummy-fi")
+    batches = project.suggest_corpus(corpus, jobs=2).batches
+    assert next(batches) is not None
+    assert len(read_batches) <= 5  # at most 2 * jobs in flight plus one
+    batches.close()
+
+
+def test_project_suggest_corpus_pipeline(registry, fulltext_corpus, monkeypatch):
+    monkeypatch.setattr(fulltext_corpus, "DOC_BATCH_SIZE", 4)
+    project = registry.get_project("dummy-fi")
+    result = list(project.suggest_corpus(fulltext_corpus, pipeline=True))
+    assert len(result) == 28  # Number of documents
+    serial_result = list(project.suggest_corpus(fulltext_corpus))
+    assert [list(hits) for hits in result] == [list(hits) for hits in serial_result]
+
+
+def test_project_suggest_corpus_pipeline_stop_early(
+    registry, fulltext_corpus, monkeypatch
+):
+    monkeypatch.setattr(fulltext_corpus, "DOC_BATCH_SIZE", 4)
+    project = registry.get_project("dummy-fi")
+    batches = project.suggest_corpus(fulltext_corpus, pipeline=True).batches
+    assert next(batches) is not None
+    batches.close()  # must not hang waiting for the transform thread
+
+
+def test_project_suggest_corpus_pipeline_transform_error(
+    registry, fulltext_corpus, monkeypatch
+):
+    monkeypatch.setattr(fulltext_corpus, "DOC_BATCH_SIZE", 4)
+    project = registry.get_project("dummy-fi")
+    calls = []
+
+    def failing_transform_texts(texts):
+        calls.append(texts)
+        if len(calls) == 3:
+            raise ValueError("transform failed")
+        return list(texts)
+
+    monkeypatch.setattr(project.transform, "transform_texts", failing_transform_texts)
+    batches = project.suggest_corpus(fulltext_corpus, pipeline=True).batches
+    with pytest.raises(ValueError, match="transform failed"):
+        list(batches)
+
+
+def test_project_suggest_corpus_pipeline_with_jobs(registry, fulltext_corpus):
+    project = registry.get_project("dummy-fi")
+    with pytest.raises(ValueError):
+        project.suggest_corpus(fulltext_corpus, jobs=2, pipeline=True)
+
+
 def test_project_suggest_corpus_transform_limit(registry, fulltext_corpus):
     project = registry.get_project("limit-transform")
     result = list(project.suggest_corpus(fulltext_corpus))
@@ -283,6 +369,16 @@ def test_project_train_state_not_available(registry, caplog):
     assert "Could not get train state information" in caplog.text
 
 
+def test_project_is_trained_cached_after_initialize(registry, monkeypatch):
+    project = registry.get_project("dummy-private")
+    project.initialize()
+    assert project.is_trained is True
+    monkeypatch.setattr(project.backend, "is_trained", False)
+    assert project.is_trained is True  # cached value
+    project.remove_model_data()
+    assert project.is_trained is False
+
+
 def test_project_transform_text_pass_through(registry):
     project = registry.get_project("dummy-transform")
     assert project.transform.transform_text("this is some text") == "this is some text"
@@ -293,6 +389,18 @@ def test_project_not_initialized(registry):
     assert not project.initialized
 
 
+def test_project_is_trained_not_cached_for_ensemble(registry, monkeypatch):
+    project = registry.get_project("ensemble")
+    project.initialize()
+    assert project.is_trained is True
+    source = registry.get_project("dummy-private")
+    monkeypatch.setattr(source.backend, "is_trained", False)
+    source.remove_model_data()
+    assert project.is_trained is False
+    with pytest.raises(NotInitializedException):
+        project.suggest(["this is some text"])
+
+
 def test_project_initialized(app_with_initialize):
     with app_with_initialize.app_context():
         project = annif.registry.get_project("dummy-en")
@@ -43,6 +43,11 @@ def test_chained_transforms_text():
     assert transf.transform_text("abcdefghij") == "cba"
 
 
+def test_chained_transforms_texts():
+    transf = annif.transform.get_transform("limit(5),pass,limit(3),", project=None)
+    assert transf.transform_texts(["abcdefghij", "abcd", "ab"]) == ["abc", "abc", "ab"]
+
+
 def test_chained_transforms_corpus(document_corpus):
     transf = annif.transform.get_transform("limit(5),pass,limit(3),", project=None)
     transformed_corpus = transf.transform_corpus(document_corpus)